@@ -1,15 +1,18 @@
 """Core configuration for MiC Dynamic Scheduler"""
 
+from types import MappingProxyType
+
+
 class Config:
     APP_VERSION = "V9.5"
 
-    # Cost Parameters
-    DEFAULT_COSTS = {
+    # Cost Parameters (defaults are read-only; take a dict() copy to customise)
+    DEFAULT_COSTS = MappingProxyType({
         'skilled': 1200, 'semi': 800, 'unskilled': 500,
         'crane': 3000, 'testing': 1500, 'specialized': 1000,
         'penalty': 2000, 'downtime': 5000
-    }
-    COSTS = DEFAULT_COSTS
+    })
+    COSTS = dict(DEFAULT_COSTS)
 
     COST_MAP = {
         'skilled': 'Skilled Labor', 'semi': 'Semi-skilled Labor',
@@ -21,10 +24,10 @@ class Config:
     EMERGENCY_MULTIPLIER = 1.2
 
     # Default Resources
-    DEFAULT_RESOURCES = {
+    DEFAULT_RESOURCES = MappingProxyType({
         'R_skilled': 10, 'R_semi': 15, 'R_unskilled': 30,
         'R_crane': 2, 'R_testing': 5, 'R_specialized': 5
-    }
+    })
 
     RES_MAP = {
         'R_skilled': 'Skilled Labor', 'R_semi': 'Semi-skilled Labor',
@@ -33,7 +36,7 @@ class Config:
     }
 
     # Default Algorithm Parameters
-    DEFAULT_ALGO = {'pop_size': 30, 'n_gen': 15, 'mutation_rate': 0.1}
+    DEFAULT_ALGO = MappingProxyType({'pop_size': 30, 'n_gen': 15, 'mutation_rate': 0.1})
 
     # Weights & Risk Configuration
     WEIGHTS = {'space': 0.4, 'system': 0.2, 'resource': 0.1, 'risk': 0.3}
@@ -3,16 +3,24 @@
 import pandas as pd
 import numpy as np
 import datetime
-import copy
 from config.base import Config
 from utils.helpers import (
     scale_feature_array,
     add_work_hours,
     get_risk_factor,
-    is_working_hour
+    is_working_hour_vec
 )
 
 
+def _clone_task(task):
+    # Task records hold scalars plus predecessor lists; copy the lists so segments don't share them
+    clone = dict(task)
+    for key, value in clone.items():
+        if isinstance(value, list):
+            clone[key] = list(value)
+    return clone
+
+
 class ProjectModel:
     def __init__(self, tasks_df, resources_limit, start_date):
         self.tasks_df = tasks_df
@@ -25,54 +33,59 @@ class ProjectModel:
         self.logs.append(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
 
     def calculate_weighted_features(self):
-        df = self.tasks_df.copy()
+        df = self.tasks_df
         if df.empty:
             return np.array([])
 
-        # Spatial features
-        spatial_features = scale_feature_array(df[['X', 'Y', 'Z']].values) * Config.WEIGHTS['space']
-
-        # Risk/urgency features
-        risk_features = scale_feature_array(df[['Urgency_C']].values) * Config.WEIGHTS['risk']
-
-        # Resource requirement features
+        # Spatial, risk/urgency, system type and resource requirement features in one matrix
         resource_cols = [col for col in df.columns if col.startswith('R_')]
-        if resource_cols:
-            resource_features = scale_feature_array(df[resource_cols].values) * Config.WEIGHTS['resource']
-        else:
-            resource_features = np.zeros((len(df), 1))
-
-        # System type features
-        system_codes = pd.factorize(df['System'])[0].reshape(-1, 1)
-        system_features = scale_feature_array(system_codes) * Config.WEIGHTS['system']
+        feature_cols = ['X', 'Y', 'Z', 'Urgency_C', '__sys_code__'] + resource_cols
+        weights = np.array([Config.WEIGHTS['space']] * 3 + [Config.WEIGHTS['risk'], Config.WEIGHTS['system']] +
+                           [Config.WEIGHTS['resource']] * len(resource_cols))
+
+        # Standardize in float64 (raw coordinates are too large for float32), then hand float32 to the
+        # downstream KMeans / silhouette distance computations to halve their memory traffic
+        features = df.assign(__sys_code__=pd.factorize(df['System'])[0])[feature_cols].to_numpy(
+            dtype=np.float64, copy=True)
+        scale_feature_array(features, out=features)
+        features *= weights
+        return features.astype(np.float32)
 
-        # Combine all features
-        feature_components = [spatial_features, risk_features, system_features]
-        if resource_cols:
-            feature_components.append(resource_features)
-
-        return np.hstack(feature_components)
+    @staticmethod
+    def _completed_work_hours(start_dts, durations, roll_dt):
+        if not start_dts:
+            return np.array([], dtype=np.int64)
+
+        starts = np.array(start_dts, dtype='datetime64[us]')
+        start_hours = starts.astype('datetime64[h]')
+        window_start = start_hours.min()
+        offsets = (start_hours - window_start).astype(np.int64)
+        # Hourly ticks start_dt, start_dt + 1h, ... that fall before roll_dt
+        spans = np.maximum(0, -((starts - np.datetime64(roll_dt, 'us')) // np.timedelta64(1, 'h')))
+        ends = offsets + spans
+
+        # Cumulative working-hour calendar over the whole window, built once for all tasks
+        window = pd.date_range(pd.Timestamp(window_start), periods=int(ends.max()), freq='h')
+        worked = np.concatenate(([0], np.cumsum(is_working_hour_vec(window))))
+        return np.minimum(durations, worked[ends] - worked[offsets])
 
     @staticmethod
     def preempt_and_split(running_tasks, roll_dt, next_free_id):
+        to_split = [task for task in running_tasks if task['end_dt'] > roll_dt]
+        durations = np.array([task['Duration_Hours'] for task in to_split])
+        completed = ProjectModel._completed_work_hours([task['start_dt'] for task in to_split], durations, roll_dt)
+        segments = zip(completed.tolist(), (durations - completed).tolist())
+
         split_tasks = []
         for task in running_tasks:
             if task['end_dt'] <= roll_dt:
                 split_tasks.append(task)
                 continue
 
-            # Calculate completed hours
-            start_dt = task['start_dt']
-            completed_hours = 0
-            current_dt = start_dt
-
-            while current_dt < roll_dt and completed_hours < task['Duration_Hours']:
-                if is_working_hour(current_dt):
-                    completed_hours += 1
-                current_dt += datetime.timedelta(hours=1)
+            completed_hours, remaining_hours = next(segments)
 
             # Create completed task segment
-            done_task = copy.deepcopy(task)
+            done_task = _clone_task(task)
             done_task['ID'] = next_free_id
             done_task['Duration_Hours'] = completed_hours
             done_task['end_dt'] = roll_dt
@@ -81,8 +94,7 @@ class ProjectModel:
             split_tasks.append(done_task)
 
             # Create remaining task segment
-            remaining_hours = task['Duration_Hours'] - completed_hours
-            rem_task = copy.deepcopy(task)
+            rem_task = _clone_task(task)
             rem_task['ID'] = next_free_id
             rem_task['Duration_Hours'] = remaining_hours
             rem_task['start_dt'] = roll_dt
@@ -1,10 +1,21 @@
 """Excel file handling for MiC Dynamic Scheduler"""
 
 import pandas as pd
+import numpy as np
 import io
+import re
 import datetime
 from config.base import Config
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+
+def _compile_keyword_scanner(col_keywords):
+    keywords = sorted({kw for kws, _ in col_keywords.values() for kw in kws}, key=lambda kw: (-len(kw), kw))
+    # The lookahead reports the longest keyword starting at each position; any shorter keyword it
+    # contains is credited through the keyword -> internal keys table
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+    keyword_keys = {kw: tuple(key for key, (kws, _) in col_keywords.items() if any(k in kw for k in kws))
+                    for kw in keywords}
+    return pattern, keyword_keys
 
 
 class FileManager:
@@ -14,6 +25,12 @@ class FileManager:
     SHEET_COSTS = "4_System_Costs"
     SHEET_EMERGENCY = "5_Emergency_Tasks"
 
+    # Cell strings pd.read_excel treats as missing by default
+    NA_STRINGS = frozenset({
+        '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+        '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+    })
+
     COL_TASK_MAP = {
         'ID': 'ID', 'System': 'System', 'Urgency_C': 'Urgency',
         'Duration_Hours': 'Duration', 'Predecessors': 'Predecessors', 'Remarks': 'Remarks',
@@ -39,6 +56,7 @@ class FileManager:
         'R_testing': (['testing', 'inspection'], []),
         'R_specialized': (['specialized', 'special'], [])
     }
+    _KW_RE, _KW_TO_KEYS = _compile_keyword_scanner(COL_KEYWORDS)
 
     @staticmethod
     def get_filename(step_prefix, description, ext="xlsx"):
@@ -48,7 +66,9 @@ class FileManager:
     @staticmethod
     def generate_master_template():
         buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        # Assemble the xlsx parts in memory instead of xlsxwriter's temp files; constant_memory can't be used
+        # because DataFrame.to_excel writes column by column
+        with pd.ExcelWriter(buffer, engine='xlsxwriter', engine_kwargs={'options': {'in_memory': True}}) as writer:
             # Task Data Sheet
             cols = list(FileManager.COL_TASK_MAP.values())
             instructions = ['Unique Int', 'Struct/Elec/Plumb/HVAC/Facade', '0-10', '>0', '1,2', 'Text', 'Float',
@@ -87,7 +107,7 @@ class FileManager:
     @staticmethod
     def parse_master_excel(uploaded_file):
         try:
-            xls = pd.ExcelFile(uploaded_file)
+            xls = pd.ExcelFile(uploaded_file, engine='openpyxl')
 
             if FileManager.SHEET_TASKS not in xls.sheet_names:
                 return None, None, None, None, None, None, f"Missing Required Sheet: {FileManager.SHEET_TASKS}"
@@ -100,26 +120,25 @@ class FileManager:
             parsed_tasks = FileManager._parse_task_df(df_tasks)
 
             # Parse Resource Configuration
-            parsed_res = Config.DEFAULT_RESOURCES.copy()
+            parsed_res = dict(Config.DEFAULT_RESOURCES)
             parsed_notes = {}
             if FileManager.SHEET_RESOURCES in xls.sheet_names:
-                df_res = pd.read_excel(xls, sheet_name=FileManager.SHEET_RESOURCES)
-                for _, row in df_res.iterrows():
+                res_rows = FileManager._read_sheet_rows(xls, FileManager.SHEET_RESOURCES,
+                                                        dtype={'Limit_Value': int, 'Note': str})
+                for row in res_rows:
                     res_key = str(row['Resource_Type']).strip()
-                    try:
-                        res_value = int(row['Limit_Value'])
-                    except (ValueError, TypeError):
+                    res_value = row['Limit_Value']
+                    if res_value is None:
                         res_value = Config.DEFAULT_RESOURCES.get(res_key, 10)
                     if res_key in parsed_res:
                         parsed_res[res_key] = res_value
-                    if 'Note' in df_res.columns and pd.notna(row['Note']):
-                        parsed_notes[res_key] = str(row['Note'])
+                    if row.get('Note') is not None:
+                        parsed_notes[res_key] = row['Note']
 
             # Parse Algorithm Parameters
-            parsed_algo = Config.DEFAULT_ALGO.copy()
+            parsed_algo = dict(Config.DEFAULT_ALGO)
             if FileManager.SHEET_ALGO in xls.sheet_names:
-                df_algo = pd.read_excel(xls, sheet_name=FileManager.SHEET_ALGO)
-                for _, row in df_algo.iterrows():
+                for row in FileManager._read_sheet_rows(xls, FileManager.SHEET_ALGO):
                     param_key = str(row['Parameter']).strip()
                     param_value = row['Value']
                     if param_key == 'mutation_rate':
@@ -128,14 +147,13 @@ class FileManager:
                         parsed_algo[param_key] = int(param_value)
 
             # Parse Cost Configuration
-            parsed_costs = Config.DEFAULT_COSTS.copy()
+            parsed_costs = dict(Config.DEFAULT_COSTS)
             if FileManager.SHEET_COSTS in xls.sheet_names:
-                df_cost = pd.read_excel(xls, sheet_name=FileManager.SHEET_COSTS)
-                for _, row in df_cost.iterrows():
+                cost_rows = FileManager._read_sheet_rows(xls, FileManager.SHEET_COSTS, dtype={'Unit_Price': int})
+                for row in cost_rows:
                     cost_key = str(row['Cost_Item']).strip()
-                    try:
-                        cost_value = int(row['Unit_Price'])
-                    except (ValueError, TypeError):
+                    cost_value = row['Unit_Price']
+                    if cost_value is None:
                         cost_value = Config.DEFAULT_COSTS.get(cost_key, 0)
                     if cost_key in parsed_costs:
                         parsed_costs[cost_key] = cost_value
@@ -143,106 +161,155 @@ class FileManager:
             # Parse Emergency Tasks
             parsed_emerg = []
             if FileManager.SHEET_EMERGENCY in xls.sheet_names:
-                df_em = pd.read_excel(xls, sheet_name=FileManager.SHEET_EMERGENCY)
-                for _, row in df_em.iterrows():
-                    try:
-                        emerg_task = {
-                            'Insert_Day': int(row['Insert_Day']),
-                            'System': row['System'],
-                            'Duration': int(row['Duration']),
-                            'Urgency': int(row.get('Urgency', 10)),
-                            'R_skilled': int(row.get('R_skilled', 0)),
-                            'R_crane': int(row.get('R_crane', 0)),
-                            'Note': str(row.get('Note', ''))
-                        }
+                emerg_counts = ['Insert_Day', 'Duration', 'Urgency', 'R_skilled', 'R_crane']
+                emerg_rows = FileManager._read_sheet_rows(xls, FileManager.SHEET_EMERGENCY,
+                                                          dtype={**dict.fromkeys(emerg_counts, int), 'Note': str})
+                for row in emerg_rows:
+                    emerg_task = {
+                        'Insert_Day': row['Insert_Day'],
+                        'System': row['System'],
+                        'Duration': row['Duration'],
+                        'Urgency': row.get('Urgency', 10),
+                        'R_skilled': row.get('R_skilled', 0),
+                        'R_crane': row.get('R_crane', 0),
+                        'Note': row.get('Note') or ''
+                    }
+                    # Skip rows with a missing or non-numeric count
+                    if all(emerg_task[field] is not None for field in emerg_counts):
                         parsed_emerg.append(emerg_task)
-                    except (ValueError, TypeError):
-                        continue
 
             return parsed_tasks, parsed_res, parsed_notes, parsed_algo, parsed_costs, parsed_emerg, None
 
         except Exception as e:
             return None, None, None, None, None, None, f"Excel Parsing Error: {str(e)}"
 
+    @staticmethod
+    def _read_sheet_rows(xls, sheet_name, dtype=None):
+        # Small config sheets: read rows straight from the workbook pandas already opened (read-only).
+        # Empty cells and pandas' default NA strings become NaN, as pd.read_excel would read them;
+        # columns listed in dtype are coerced once here, with missing or unconvertible cells as None
+        rows = xls.book[sheet_name].iter_rows(values_only=True)
+        header = next(rows, ())
+        records = []
+        for row in rows:
+            row = [np.nan if FileManager._is_na_cell(value) else value for value in row]
+            if all(value is np.nan for value in row):
+                continue
+            record = dict(zip(header, row))
+            for col, target_type in (dtype or {}).items():
+                if col in record:
+                    record[col] = FileManager._coerce_cell(record[col], target_type)
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _is_na_cell(value):
+        return value is None or (isinstance(value, str) and value in FileManager.NA_STRINGS)
+
+    @staticmethod
+    def _coerce_cell(value, target_type):
+        if pd.isna(value):
+            return None
+        try:
+            return target_type(value)
+        except (ValueError, TypeError):
+            return None
+
     @staticmethod
     def _parse_task_df(df_data):
-        tasks = []
         col_mapping = FileManager._map_task_columns(df_data.columns)
 
-        for _, row in df_data.iterrows():
-            task = {}
-
-            # Parse Task ID
-            id_col = col_mapping.get('ID')
-            if not id_col:
-                continue
-            try:
-                task['ID'] = int(float(row[id_col]))
-            except (ValueError, TypeError):
-                continue
+        # Parse Task ID, dropping rows without a numeric ID
+        id_col = col_mapping.get('ID')
+        if not id_col:
+            return []
+        ids = FileManager._to_numeric(df_data[id_col])
+        valid_rows = np.isfinite(ids)
+        df_data = df_data[valid_rows]
+        tasks = pd.DataFrame({'ID': ids[valid_rows].astype(int)}, index=df_data.index)
+
+        # Basic Task Metadata
+        system_col = col_mapping.get('System')
+        tasks['System'] = df_data[system_col] if system_col else 'Struct'
+        remarks_col = col_mapping.get('Remarks')
+        if remarks_col:
+            remarks = df_data[remarks_col]
+            tasks['Remarks'] = remarks.map(str).where(remarks.notna(), '')
+        else:
+            tasks['Remarks'] = ''
+
+        # Parse Predecessors
+        pred_col = col_mapping.get('Predecessors')
+        if pred_col:
+            # Cast to object first: fillna('') leaves NaT in a datetime64 column (Excel-converted "1/2" cells)
+            pred_tokens = (df_data[pred_col].astype(object).fillna('').astype(str)
+                           .str.replace(r'[\[\]\s;]', ',', regex=True).str.split(','))
+            tasks['Predecessors'] = pred_tokens.map(FileManager._parse_predecessors)
+        else:
+            tasks['Predecessors'] = pd.Series([[] for _ in range(len(df_data))], index=df_data.index, dtype=object)
+
+        # Parse Numeric Fields
+        numeric_fields = ['Urgency_C', 'Duration_Hours'] + [k for k in FileManager.COL_KEYWORDS if k.startswith('R_')]
+        for field in numeric_fields:
+            col_name = col_mapping.get(field)
+            tasks[field] = FileManager._parse_numeric_column(df_data[col_name], int) if col_name else 0
+        tasks['Duration_Hours'] = tasks['Duration_Hours'].clip(lower=1)
+
+        # Parse Spatial Coordinates
+        spatial_fields = ['X', 'Y', 'Z']
+        for field in spatial_fields:
+            col_name = col_mapping.get(field)
+            tasks[field] = FileManager._parse_numeric_column(df_data[col_name], float) if col_name else 0.0
+
+        return tasks.to_dict(orient='records')
 
-            # Basic Task Metadata
-            task['System'] = row.get(col_mapping.get('System'), 'Struct')
-            task['Remarks'] = str(row.get(col_mapping.get('Remarks', ''))) if pd.notna(
-                row.get(col_mapping.get('Remarks'))) else ''
-
-            # Parse Predecessors
-            pred_col = col_mapping.get('Predecessors')
-            pred_str = str(row.get(pred_col, '')).strip() if pred_col else ''
-            task['Predecessors'] = []
-            if pred_str:
-                cleaned_preds = pred_str.replace(';', ',').replace('[', '').replace(']', '').replace(' ', '')
-                task['Predecessors'] = [int(float(p)) for p in cleaned_preds.split(',') if
-                                        p.replace('.', '', 1).isdigit()]
-
-            # Parse Numeric Fields
-            numeric_fields = ['Urgency_C', 'Duration_Hours'] + [k for k in FileManager.COL_KEYWORDS if
-                                                                k.startswith('R_')]
-            for field in numeric_fields:
-                col_name = col_mapping.get(field)
-                task[field] = FileManager._parse_numeric_value(row.get(col_name, 0), int)
-            task['Duration_Hours'] = max(1, task['Duration_Hours'])
-
-            # Parse Spatial Coordinates
-            spatial_fields = ['X', 'Y', 'Z']
-            for field in spatial_fields:
-                col_name = col_mapping.get(field)
-                task[field] = FileManager._parse_numeric_value(row.get(col_name, 0.0), float)
-
-            tasks.append(task)
-        return tasks
+    @staticmethod
+    def _parse_predecessors(tokens):
+        return [int(float(p)) for p in tokens if p.replace('.', '', 1).isdigit()]
 
     @staticmethod
     def _map_task_columns(available_columns):
-        col_map = {}
-        available_lower = [col.lower() for col in available_columns]
+        exact_cols = {}
+        keyword_cols = {}
+        for col in available_columns:
+            col_lower = col.lower()
+            exact_cols.setdefault(col_lower, col)
+            for kw in set(FileManager._KW_RE.findall(col_lower)):
+                for internal_key in FileManager._KW_TO_KEYS[kw]:
+                    excludes = FileManager.COL_KEYWORDS[internal_key][1]
+                    if internal_key not in keyword_cols and not any(ex in col_lower for ex in excludes):
+                        keyword_cols[internal_key] = col
 
-        for internal_key, (keywords, excludes) in FileManager.COL_KEYWORDS.items():
+        col_map = {}
+        for internal_key in FileManager.COL_KEYWORDS:
             display_name = FileManager.COL_TASK_MAP.get(internal_key, '')
-            if display_name.lower() in available_lower:
-                col_map[internal_key] = available_columns[available_lower.index(display_name.lower())]
-                continue
-
-            for idx, col in enumerate(available_columns):
-                col_lower = col.lower()
-                if any(kw in col_lower for kw in keywords) and not any(ex in col_lower for ex in excludes):
-                    col_map[internal_key] = col
-                    break
+            if display_name.lower() in exact_cols:
+                col_map[internal_key] = exact_cols[display_name.lower()]
+            elif internal_key in keyword_cols:
+                col_map[internal_key] = keyword_cols[internal_key]
         return col_map
 
     @staticmethod
-    def _parse_numeric_value(value, target_type):
-        try:
-            return target_type(float(value))
-        except (ValueError, TypeError):
-            return target_type(0)
+    def _to_numeric(values):
+        # Date/time cells are not numbers (float() rejects them); pd.to_numeric would return epoch integers
+        if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+            return pd.Series(np.nan, index=values.index)
+        if values.dtype == object:
+            values = values.mask(values.map(FileManager._is_datetime_like))
+        return pd.to_numeric(values, errors='coerce')
+
+    @staticmethod
+    def _is_datetime_like(value):
+        return value is pd.NaT or isinstance(
+            value, (datetime.date, datetime.time, datetime.timedelta, np.datetime64, np.timedelta64))
+
+    @staticmethod
+    def _parse_numeric_column(values, target_type):
+        numeric = FileManager._to_numeric(values)
+        return numeric.where(np.isfinite(numeric), 0).astype(target_type)
 
     @staticmethod
     def generate_schedule_report(schedule_df):
         if schedule_df.empty:
             return None
         return schedule_df.to_csv(index=False).encode('utf-8-sig')
-
-
-import xlsxwriter
-import openpyxl
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""Hour-by-hour working calendar the scheduling tests compare against"""
+
+import datetime
+
+from config.base import Config
+
+
+def is_working_hour(dt_obj):
+    return dt_obj.weekday() != 6 and any(start <= dt_obj.hour < end for start, end in Config.WORK_HOURS)
+
+
+def working_hours_from(start_dt):
+    # start_dt, start_dt + 1h, ... keeping only the ticks that fall in a working hour
+    current_dt = start_dt
+    while True:
+        if is_working_hour(current_dt):
+            yield current_dt
+        current_dt += datetime.timedelta(hours=1)
@@ -0,0 +1,75 @@
+"""Regression tests for io.excel_handler"""
+
+import importlib.util
+import os
+import unittest
+
+import pandas as pd
+
+# The project's io/ package is shadowed by the standard library io module, so load the handler by path
+_HANDLER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'io', 'excel_handler.py')
+_spec = importlib.util.spec_from_file_location('excel_handler', _HANDLER_PATH)
+excel_handler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(excel_handler)
+FileManager = excel_handler.FileManager
+
+
+class MapTaskColumnsTest(unittest.TestCase):
+    def test_template_headers_map_exactly(self):
+        columns = list(FileManager.COL_TASK_MAP.values())
+        self.assertEqual(FileManager._map_task_columns(columns), FileManager.COL_TASK_MAP)
+
+    def test_keyword_matches(self):
+        col_map = FileManager._map_task_columns(['Task ID', 'Coord_X', 'Total Hours', 'Crane units'])
+        self.assertEqual(col_map['ID'], 'Task ID')
+        self.assertEqual(col_map['X'], 'Coord_X')
+        self.assertEqual(col_map['Duration_Hours'], 'Total Hours')
+        self.assertEqual(col_map['R_crane'], 'Crane units')
+
+    def test_excludes(self):
+        col_map = FileManager._map_task_columns(['Unskilled Workers', 'Semi Skilled'])
+        self.assertNotIn('R_skilled', col_map)
+        self.assertEqual(col_map['R_unskilled'], 'Unskilled Workers')
+        self.assertEqual(col_map['R_semi'], 'Semi Skilled')
+
+    def test_keyword_inside_longer_keyword(self):
+        # 'y' inside 'urgency' and 'special' inside 'specialized' still count as hits
+        col_map = FileManager._map_task_columns(['Urgency Level', 'Specialized Kit'])
+        self.assertEqual(col_map['Y'], 'Urgency Level')
+        self.assertEqual(col_map['R_specialized'], 'Specialized Kit')
+
+    def test_exact_display_name_beats_earlier_keyword_match(self):
+        col_map = FileManager._map_task_columns(['hours', 'Duration'])
+        self.assertEqual(col_map['Duration_Hours'], 'Duration')
+
+    def test_first_matching_column_wins(self):
+        col_map = FileManager._map_task_columns(['time_a', 'duration_b'])
+        self.assertEqual(col_map['Duration_Hours'], 'time_a')
+
+    def test_matching_ignores_case(self):
+        col_map = FileManager._map_task_columns(['TASK ID', 'DURATION', 'HOIST QTY'])
+        self.assertEqual(col_map['ID'], 'TASK ID')
+        self.assertEqual(col_map['Duration_Hours'], 'DURATION')
+        self.assertEqual(col_map['R_crane'], 'HOIST QTY')
+
+    def test_no_columns(self):
+        self.assertEqual(FileManager._map_task_columns([]), {})
+
+
+class ParseTaskDfTest(unittest.TestCase):
+    def test_predecessor_list_formats(self):
+        df = pd.DataFrame({'ID': [1, 2, 3, 4], 'Duration': [4, 4, 4, 4],
+                           'Predecessors': ['1 2', '[3; 4.0]', None, '-1,5']})
+        tasks = FileManager._parse_task_df(df)
+        self.assertEqual([task['Predecessors'] for task in tasks], [[1, 2], [3, 4], [], [5]])
+
+    def test_date_predecessor_column_with_blanks(self):
+        # Excel turns entries like "1/2" into dates; with blank cells pandas reads a datetime64 column with NaT
+        df = pd.DataFrame({'ID': [1, 2], 'Duration': [4, 5],
+                           'Predecessors': pd.to_datetime(['2024-01-02', None])})
+        tasks = FileManager._parse_task_df(df)
+        self.assertEqual([(task['ID'], task['Predecessors']) for task in tasks], [(1, []), (2, [])])
+
+
+if __name__ == '__main__':
+    unittest.main()
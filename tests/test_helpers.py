@@ -0,0 +1,92 @@
+"""Regression tests for the calendar helpers in utils.helpers"""
+
+import datetime
+import itertools
+import math
+import unittest
+
+from config.base import Config
+from tests import calendar_reference
+from utils.helpers import add_work_hours, calculate_risk_integral, is_working_hour
+
+
+def _risk_integral_reference(start_dt, duration_hours, urgency):
+    ticks = itertools.islice(calendar_reference.working_hours_from(start_dt), math.ceil(duration_hours))
+    return sum(Config.HK_WEATHER_RISK[tick.month][0] for tick in ticks) * urgency / 10.0 * 100
+
+
+class IsWorkingHourTest(unittest.TestCase):
+    def test_matches_config_work_hours(self):
+        for hour_of_week in range(7 * 24):
+            dt_obj = datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=hour_of_week)
+            self.assertEqual(is_working_hour(dt_obj), calendar_reference.is_working_hour(dt_obj), dt_obj)
+
+
+class AddWorkHoursTest(unittest.TestCase):
+    # 2024-01-01 is a Monday; 2024-01-06 a Saturday; 2024-01-07 a Sunday
+
+    def test_within_morning_shift(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 8), 1), datetime.datetime(2024, 1, 1, 9))
+
+    def test_skips_lunch_gap(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 8), 4), datetime.datetime(2024, 1, 1, 13))
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 12, 15), 1),
+                         datetime.datetime(2024, 1, 1, 14))
+
+    def test_full_day_rolls_to_next_morning(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 8), 8), datetime.datetime(2024, 1, 2, 8))
+
+    def test_skips_sunday_and_wraps_week(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 6, 16), 1), datetime.datetime(2024, 1, 8, 8))
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 8), 48), datetime.datetime(2024, 1, 8, 8))
+
+    def test_sunday_start_moves_to_monday(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 7, 10), 1), datetime.datetime(2024, 1, 8, 9))
+
+    def test_non_integer_hours_round_up(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 8), 2.5), datetime.datetime(2024, 1, 1, 11))
+
+    def test_minute_offset_start_is_truncated(self):
+        self.assertEqual(add_work_hours(datetime.datetime(2024, 1, 1, 9, 30), 1), datetime.datetime(2024, 1, 1, 10))
+
+    def test_non_positive_hours_return_start(self):
+        start = datetime.datetime(2024, 1, 7, 3, 45)
+        self.assertEqual(add_work_hours(start, 0), start)
+        self.assertEqual(add_work_hours(start, -2), start)
+
+    def test_every_start_hour_of_the_week(self):
+        for hour_of_week in range(7 * 24):
+            start = datetime.datetime(2024, 1, 1, minute=17) + datetime.timedelta(hours=hour_of_week)
+            for hours in (1, 4, 5, 8, 47, 48, 49, 2.5):
+                working = calendar_reference.working_hours_from(start.replace(minute=0))
+                expected = next(itertools.islice(working, math.ceil(hours), None))
+                self.assertEqual(add_work_hours(start, hours), expected, (start, hours))
+
+
+class CalculateRiskIntegralTest(unittest.TestCase):
+    def test_single_month(self):
+        self.assertAlmostEqual(calculate_risk_integral(datetime.datetime(2024, 1, 1, 8), 8, 5), 4.0)
+
+    def test_crosses_month_boundary(self):
+        # Wed 31 Jul 16:00 (July risk 0.50), then Thu 1 Aug 08:00 (August risk 0.60)
+        self.assertAlmostEqual(calculate_risk_integral(datetime.datetime(2024, 7, 31, 16), 2, 10), 110.0)
+
+    def test_sunday_start_counts_from_monday(self):
+        self.assertAlmostEqual(calculate_risk_integral(datetime.datetime(2024, 1, 7, 0), 1, 10), 1.0)
+
+    def test_full_week_from_late_saturday(self):
+        start = datetime.datetime(2024, 6, 29, 17)
+        self.assertAlmostEqual(calculate_risk_integral(start, 48, 10), _risk_integral_reference(start, 48, 10))
+
+    def test_non_positive_duration(self):
+        self.assertEqual(calculate_risk_integral(datetime.datetime(2024, 1, 1, 8), 0, 10), 0.0)
+
+    def test_spans_several_months_and_year_end(self):
+        start = datetime.datetime(2024, 11, 29, 10, 30)
+        for duration in (30, 200, 2.5):
+            self.assertAlmostEqual(calculate_risk_integral(start, duration, 7),
+                                   _risk_integral_reference(start, duration, 7), msg=duration)
+
+
+if __name__ == '__main__':
+    unittest.main()
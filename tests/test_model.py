@@ -0,0 +1,85 @@
+"""Regression tests for core.model"""
+
+import datetime
+import itertools
+import unittest
+
+from core.model import ProjectModel
+from tests import calendar_reference
+
+
+def _make_task(task_id, start_dt, duration, end_offset_hours=500):
+    return {
+        'ID': task_id, 'start_dt': start_dt, 'end_dt': start_dt + datetime.timedelta(hours=end_offset_hours),
+        'Duration_Hours': duration, 'Predecessors': [task_id - 1]
+    }
+
+
+class PreemptAndSplitTest(unittest.TestCase):
+    # 2024-01-01 is a Monday; 2024-01-06 a Saturday
+
+    def _split_one(self, start_dt, duration, roll_dt):
+        split_tasks, _ = ProjectModel.preempt_and_split([_make_task(1, start_dt, duration)], roll_dt, 100)
+        return split_tasks[0]['Duration_Hours'], split_tasks[1]['Duration_Hours']
+
+    def test_skips_lunch_gap(self):
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 1, 8), 20, datetime.datetime(2024, 1, 1, 15)),
+                         (6, 14))
+
+    def test_skips_sunday_across_week_wrap(self):
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 6, 15), 20, datetime.datetime(2024, 1, 8, 10)),
+                         (4, 16))
+
+    def test_minute_offset_start(self):
+        # Ticks at 08:30 and 09:30 fall before the 10:15 roll
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 1, 8, 30), 20,
+                                         datetime.datetime(2024, 1, 1, 10, 15)), (2, 18))
+
+    def test_not_started_task_has_no_completed_hours(self):
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 2, 8), 20, datetime.datetime(2024, 1, 1, 10)),
+                         (0, 20))
+
+    def test_completed_hours_capped_at_duration(self):
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 1, 8), 3, datetime.datetime(2024, 1, 1, 17)),
+                         (3, 0))
+
+    def test_non_integer_duration_is_capped(self):
+        self.assertEqual(self._split_one(datetime.datetime(2024, 1, 1, 8), 2.5, datetime.datetime(2024, 1, 1, 17)),
+                         (2.5, 0.0))
+
+    def test_order_ids_and_passthrough(self):
+        start = datetime.datetime(2024, 1, 1, 8)
+        finished = _make_task(1, start, 1, end_offset_hours=1)
+        running = _make_task(2, start, 20)
+        roll_dt = start + datetime.timedelta(hours=2)
+        split_tasks, next_free_id = ProjectModel.preempt_and_split([running, finished], roll_dt, 100)
+
+        self.assertEqual(next_free_id, 102)
+        self.assertEqual([(task['ID'], task.get('status')) for task in split_tasks],
+                         [(100, 'Split-Done'), (101, 'Split-Remaining'), (1, None)])
+        self.assertIs(split_tasks[2], finished)
+        self.assertEqual(split_tasks[1]['predecessors'], [100])
+
+    def test_segments_do_not_share_predecessor_lists(self):
+        task = _make_task(5, datetime.datetime(2024, 1, 1, 8), 20)
+        split_tasks, _ = ProjectModel.preempt_and_split([task], datetime.datetime(2024, 1, 1, 10), 100)
+        split_tasks[0]['Predecessors'].append(99)
+        self.assertEqual(task['Predecessors'], [4])
+        self.assertEqual(split_tasks[1]['Predecessors'], [4])
+
+    def test_several_tasks_across_a_weekend(self):
+        roll_dt = datetime.datetime(2024, 1, 8, 10, 45)
+        tasks = [_make_task(1, datetime.datetime(2024, 1, 4, 13, 30), 40),
+                 _make_task(2, datetime.datetime(2024, 1, 6, 9), 6),
+                 _make_task(3, datetime.datetime(2024, 1, 5, 22), 100)]
+        split_tasks, _ = ProjectModel.preempt_and_split(tasks, roll_dt, 100)
+
+        expected = []
+        for task in tasks:
+            ticks = itertools.islice(calendar_reference.working_hours_from(task['start_dt']), task['Duration_Hours'])
+            expected.append(sum(1 for tick in ticks if tick < roll_dt))
+        self.assertEqual([task['Duration_Hours'] for task in split_tasks[::2]], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,24 +2,52 @@
 
 import numpy as np
 import datetime
+import math
 from config.base import Config
 
-
-def scale_feature_array(feature_array, scaler=StandardScaler()):
-    if len(feature_array) == 0:
+# Monthly weather risk (probability, severity) indexed by month number; index 0 is unused
+_RISK_PROB = np.array([0.0] + [Config.HK_WEATHER_RISK[month][0] for month in range(1, 13)])
+_RISK_SEV = np.array([0.0] + [Config.HK_WEATHER_RISK[month][1] for month in range(1, 13)])
+
+# Working-hour lookup indexed by weekday * 24 + hour (Monday-Saturday shifts, Sunday off)
+_WH_LUT = np.zeros(7 * 24, dtype=bool)
+for _weekday in range(6):
+    for _start, _end in Config.WORK_HOURS:
+        _WH_LUT[_weekday * 24 + _start:_weekday * 24 + _end] = True
+_WH_TABLE = tuple(_WH_LUT.tolist())
+_WORK_HOURS_PER_WEEK = int(_WH_LUT.sum())
+# Hour-of-week of the n-th working hour, and number of working hours before each hour-of-week
+_WEEK_SLOTS = tuple(np.flatnonzero(_WH_LUT).tolist())
+_SLOTS_BEFORE = tuple((np.cumsum(_WH_LUT) - _WH_LUT).tolist())
+
+
+def scale_feature_array(feature_array, out=None, dtype=np.float64):
+    feature_array = np.asarray(feature_array, dtype=dtype)
+    if feature_array.size == 0:
         return np.array([])
-    return scaler.fit_transform(feature_array)
+
+    # Accumulate the statistics in float64 even for float32 input; float32 axis-0 sums lose the spread
+    # of large coordinates (e.g. HK1980 grid values)
+    mean = feature_array.mean(axis=0, dtype=np.float64)
+    std = feature_array.std(axis=0, dtype=np.float64)
+    std = np.where(std == 0, 1.0, std)
+    if out is None:
+        out = np.empty_like(feature_array)
+    np.subtract(feature_array, mean, out=out)
+    np.divide(out, std, out=out)
+    return out
 
 
 def get_risk_factor(date_obj):
-    return Config.HK_WEATHER_RISK.get(date_obj.month, (0, 0))
+    return _RISK_PROB[date_obj.month], _RISK_SEV[date_obj.month]
 
 
 def is_working_hour(dt_obj):
-    if dt_obj.weekday() == 6:
-        return False
-    current_hour = dt_obj.hour
-    return any(start <= current_hour < end for start, end in Config.WORK_HOURS)
+    return _WH_TABLE[dt_obj.weekday() * 24 + dt_obj.hour]
+
+
+def is_working_hour_vec(date_index):
+    return _WH_LUT[np.asarray(date_index.weekday) * 24 + np.asarray(date_index.hour)]
 
 
 def add_work_hours(start_dt, hours_needed):
@@ -27,77 +55,88 @@ def add_work_hours(start_dt, hours_needed):
         return start_dt
 
     current_dt = start_dt.replace(minute=0, second=0, microsecond=0)
-    while not is_working_hour(current_dt):
-        current_dt += datetime.timedelta(hours=1)
+    week_start = current_dt - datetime.timedelta(days=current_dt.weekday(), hours=current_dt.hour)
+    # First working hour at or after current_dt, counted from the start of its week, then step forward
+    rank = _SLOTS_BEFORE[current_dt.weekday() * 24 + current_dt.hour] + math.ceil(hours_needed)
+    weeks, slot = divmod(rank, _WORK_HOURS_PER_WEEK)
+    return week_start + datetime.timedelta(weeks=weeks, hours=_WEEK_SLOTS[slot])
 
-    hours_added = 0
-    while hours_added < hours_needed:
-        current_dt += datetime.timedelta(hours=1)
-        if is_working_hour(current_dt):
-            hours_added += 1
-    return current_dt
 
+def _slots_before(dt_obj):
+    # Working hours strictly before the hour containing dt_obj, counted from 0001-01-01 (a Monday)
+    weeks = (dt_obj.toordinal() - 1) // 7
+    return weeks * _WORK_HOURS_PER_WEEK + _SLOTS_BEFORE[dt_obj.weekday() * 24 + dt_obj.hour]
 
-def calculate_risk_integral(start_dt, duration_hours, urgency):
-    total_risk = 0.0
-    current_dt = start_dt
-    hours_counted = 0
-    urgency_factor = urgency / 10.0
 
-    while hours_counted < duration_hours:
-        if is_working_hour(current_dt):
-            risk_prob, _ = get_risk_factor(current_dt)
-            total_risk += risk_prob * urgency_factor
-            hours_counted += 1
-        current_dt += datetime.timedelta(hours=1)
+def calculate_risk_integral(start_dt, duration_hours, urgency):
+    if duration_hours <= 0:
+        return 0.0
 
-    return total_risk * 100
+    # The task occupies the working slots [first, last); weight each calendar month's share by its risk
+    first = _slots_before(start_dt)
+    last = first + math.ceil(duration_hours)
+    total_risk = 0.0
+    month_start = datetime.datetime(start_dt.year, start_dt.month, 1)
+    while True:
+        if month_start.month == 12:
+            next_month = datetime.datetime(month_start.year + 1, 1, 1)
+        else:
+            next_month = datetime.datetime(month_start.year, month_start.month + 1, 1)
+        month_end = min(last, _slots_before(next_month))
+        total_risk += _RISK_PROB[month_start.month] * (month_end - first)
+        if month_end == last:
+            break
+        first = month_end
+        month_start = next_month
+
+    return float(total_risk) * (urgency / 10.0) * 100
 
 
 def check_cycles(tasks_list, new_pred, target_id):
-    task_graph = {task['ID']: task['Predecessors'].copy() for task in tasks_list}
-    if target_id not in task_graph:
+    id_to_idx = {task['ID']: idx for idx, task in enumerate(tasks_list)}
+    if target_id not in id_to_idx:
         return False
-
-    task_graph[target_id].append(new_pred)
-
-    visited = set()
-    stack = set()
-
-    def dfs_visit(node):
-        if node in stack:
+    target = id_to_idx[target_id]
+
+    # CSR adjacency of task -> predecessors, with the proposed edge added to the target
+    indptr, indices = [0], []
+    for idx, task in enumerate(tasks_list):
+        preds = task['Predecessors'] + [new_pred] if idx == target else task['Predecessors']
+        indices.extend(id_to_idx[pred] for pred in preds if pred in id_to_idx)
+        indptr.append(len(indices))
+
+    # Iterative DFS; next_edge tracks how far each node on the stack has been expanded
+    visited = bytearray(len(tasks_list))
+    on_path = bytearray(len(tasks_list))
+    next_edge = indptr[:-1]
+    stack = [target]
+    visited[target] = on_path[target] = 1
+    while stack:
+        node = stack[-1]
+        if next_edge[node] == indptr[node + 1]:
+            on_path[node] = 0
+            stack.pop()
+            continue
+
+        neighbor = indices[next_edge[node]]
+        next_edge[node] += 1
+        if on_path[neighbor]:
             return True
-        if node in visited:
-            return False
-        visited.add(node)
-        stack.add(node)
-
-        for neighbor in task_graph.get(node, []):
-            if dfs_visit(neighbor):
-                return True
-        stack.remove(node)
-        return False
-
-    return dfs_visit(target_id)
+        if not visited[neighbor]:
+            visited[neighbor] = on_path[neighbor] = 1
+            stack.append(neighbor)
+    return False
 
 
 def find_elbow_point(sse_values):
     if len(sse_values) < 3:
         return 0
 
-    coords = np.array(list(enumerate(sse_values)))
-    p1 = coords[0]
-    p2 = coords[-1]
-    direction_vec = p2 - p1
-    direction_vec = direction_vec / np.linalg.norm(direction_vec)
-
-    max_distance = -1
-    elbow_index = 0
-    for idx, point in enumerate(coords):
-        cross_product = np.linalg.norm(np.cross(direction_vec, point - p1))
-        if cross_product > max_distance:
-            max_distance = cross_product
-            elbow_index = idx
-    return elbow_index
-
-from sklearn.preprocessing import StandardScaler
\ No newline at end of file
+    sse = np.asarray(sse_values, dtype=np.float64)
+    dx = len(sse) - 1.0
+    dy = sse[-1] - sse[0]
+    length = math.hypot(dx, dy)
+
+    # Distance of each point from the first-to-last chord (2D cross product with its unit vector)
+    distances = np.abs(dx / length * (sse - sse[0]) - dy / length * np.arange(len(sse)))
+    return int(np.argmax(distances))
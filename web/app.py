@@ -25,13 +25,25 @@ from core.model import ProjectModel
 st.set_page_config(page_title="MiC Dynamic Scheduler V9.5", layout="wide")
 
 
+@st.cache_data(show_spinner=False)
+def load_master_template():
+    # The template is deterministic; build it once instead of on every rerun
+    return FileManager.generate_master_template()
+
+
+@st.cache_data(show_spinner=False)
+def build_weighted_features(tasks_df, resources_limit, start_date):
+    # Keyed on the parsed task table, so reruns with the same upload skip the feature build
+    return ProjectModel(tasks_df, resources_limit, start_date).calculate_weighted_features()
+
+
 def main():
     st.title(f"MiC Dynamic Scheduler {Config.APP_VERSION}")
     st.write("A dynamic scheduling system for MiC projects with clustering and optimization.")
 
 
     st.subheader("1. Download Input Template")
-    template_data = FileManager.generate_master_template()
+    template_data = load_master_template()
     st.download_button(
         label="Download Excel Template",
         data=template_data,
@@ -56,9 +68,8 @@ def main():
                 if st.button("Initialize Scheduling Model"):
                     tasks_df = pd.DataFrame(parsed_tasks)
                     start_date = datetime.date.today()
-                    project = ProjectModel(tasks_df, parsed_res, start_date)
                     st.success(f"Model initialized with start date: {start_date}")
-                    st.write("### Feature Matrix Shape:", project.calculate_weighted_features().shape)
+                    st.write("### Feature Matrix Shape:", build_weighted_features(tasks_df, parsed_res, start_date).shape)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file